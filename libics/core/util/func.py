@@ -1,5 +1,4 @@
 # System Imports
-import collections
 import functools
 import threading
 import time
@@ -17,6 +16,9 @@ class Memoize(object):
     If called later with the same arguments, the cached value is returned
     (not reevaluated).
 
+    Wraps :py:func:`functools.lru_cache` with unbounded cache size.
+    Calls with unhashable arguments are evaluated without caching.
+
     Examples
     --------
     >>> @Memoize
@@ -26,19 +28,22 @@ class Memoize(object):
 
     def __init__(self, func):
         self.func = func
-        self.cache = {}
+        self._cached_func = functools.lru_cache(maxsize=None)(func)
+        self.cache_info = self._cached_func.cache_info
+        self.cache_clear = self._cached_func.cache_clear
+        functools.update_wrapper(self, func)
 
     def __call__(self, *args):
-        if not isinstance(args, collections.Hashable):
-            # uncacheable. a list, for instance.
-            # better to not cache than blow up.
-            return self.func(*args)
-        if args in self.cache:
-            return self.cache[args]
-        else:
-            value = self.func(*args)
-            self.cache[args] = value
-            return value
+        try:
+            return self._cached_func(*args)
+        except TypeError:
+            try:
+                hash(args)
+            except TypeError:
+                # uncacheable. a list, for instance.
+                # better to not cache than blow up.
+                return self.func(*args)
+            raise
 
     def __repr__(self):
         return self.func.__doc__
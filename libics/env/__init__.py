@@ -1,8 +1,6 @@
-import inspect
 import json
 import os
 import shutil
-import sys
 
 from . import logging
 from . import system
@@ -57,12 +55,8 @@ def WRITE_JSON(file_path, obj):
 LIBICS_VERSION_MAJOR = 1
 LIBICS_VERSION_MINOR = 1
 LIBICS_VERSION_DEV = "a"
-LIBICS_VERSION = (
-    str(LIBICS_VERSION_MAJOR) + "."
-    + str(LIBICS_VERSION_MINOR)
-    + LIBICS_VERSION_DEV
-)
-short_version = str(LIBICS_VERSION_MAJOR) + "." + str(LIBICS_VERSION_MINOR)
+short_version = f"{LIBICS_VERSION_MAJOR:d}.{LIBICS_VERSION_MINOR:d}"
+LIBICS_VERSION = f"{short_version}{LIBICS_VERSION_DEV}"
 __version__ = LIBICS_VERSION
 
 
@@ -75,16 +69,13 @@ __version__ = LIBICS_VERSION
 DIR_CWD = os.getcwd()
 
 # LibICS source code
-DIR_SRCROOT = os.path.dirname(os.path.dirname(os.path.abspath(
-    inspect.getfile(inspect.currentframe())
-)))
+DIR_SRCROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DIR_PKGROOT = os.path.dirname(DIR_SRCROOT)
 DIR_ASSETSROOT = os.path.join(DIR_SRCROOT, "assets")
 
-# User environment
-DIR_USER = (os.environ["USERPROFILE"] if sys.platform == "win32"
-            else os.path.expanduser("~"))
+# User environment (`expanduser` resolves `USERPROFILE` on Windows)
 DIR_HOME = os.path.expanduser("~")
+DIR_USER = DIR_HOME
 DIR_DOCUMENTS = os.path.join(DIR_USER, "Documents")
 DIR_DESKTOP = os.path.join(DIR_USER, "Desktop")
 DIR_DOWNLOAD = os.path.join(DIR_USER, "Download")
@@ -1,3 +1,11 @@
+import importlib
+
 from . import math
-from . import plot
 from . import trafo
+
+
+def __getattr__(name):
+    # Import `plot` (and thus `matplotlib.pyplot`) only on first access
+    if name == "plot":
+        return importlib.import_module(f"{__name__}.plot")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,3 @@
-import itertools
 import numpy as np
 from scipy import ndimage, signal
 
@@ -10,7 +9,6 @@ from libics.tools.math.models import ModelBase, RvContinuous
 from libics.tools.math.peaked import (
     FitGaussian1d, FitLorentzian1dAbs, FitSkewGaussian1d
 )
-from libics.tools import plot
 
 
 ###############################################################################
@@ -94,46 +92,59 @@ def find_peaks_1d(
 
     Returns
     -------
-    result : `dict(str->list(float))`
+    result : `dict(str->np.ndarray(1, float) or list)`
         Dictionary containing the following items:
     center, center_err
         Peak positions and uncertainties.
     width
         Peak width.
     fit
-        Fit object.
+        List of fit objects.
     """
     # Parse parameters
     if isinstance(ret_vals, str):
         ret_vals = [ret_vals]
     ret_vals = set(misc.assume_iter(ret_vals))
-    result = {"center": [], "center_err": []}
-    if "width" in ret_vals:
-        result["width"] = []
-    if "fit" in ret_vals:
-        if fit_algorithm == "mean":
-            raise ValueError("Cannot return `fit` for algorithm `mean`.")
-        result["fit"] = []
+    if "fit" in ret_vals and fit_algorithm == "mean":
+        raise ValueError("Cannot return `fit` for algorithm `mean`.")
     # Find peak slices
     peaks = find_peaks_1d_prominence(
         *data, npeaks=npeaks, rel_prominence=rel_prominence,
         base_prominence_ratio=base_prominence_ratio,
         edge_peaks=edge_peaks, check_npeaks=check_npeaks
     )
+    _npeaks = len(peaks["data"])
+    result = {
+        "center": np.empty(_npeaks, dtype=float),
+        "center_err": np.empty(_npeaks, dtype=float)
+    }
+    if "width" in ret_vals:
+        result["width"] = np.empty(_npeaks, dtype=float)
     if _DEBUG:
+        from libics.tools import plot
         plot.plot(data, color="black")
     # Peak by mean
     if fit_algorithm == "mean":
-        _prob_min = np.mean([x.min() for x in peaks["data"]])
-        for x in peaks["data"]:
-            _prob = np.array(x) - _prob_min
-            _prob = _prob / _prob.sum()
-            _mean = (_prob * x.get_points(0)).sum()
-            _std = np.sqrt((_prob * (x.get_points(0) - _mean)**2).sum())
-            result["center"].append(_mean)
-            result["center_err"].append(_std / np.sqrt(len(x)))
+        if _npeaks > 0:
+            # Concatenate peaks to reduce all peaks in single ufunc calls
+            _vals = [
+                np.asarray(_ad.data, dtype=float) for _ad in peaks["data"]
+            ]
+            _sizes = np.array([len(_v) for _v in _vals])
+            _idxs = np.cumsum(_sizes) - _sizes
+            _vals = np.concatenate(_vals)
+            _xs = np.concatenate([_ad.get_points(0) for _ad in peaks["data"]])
+            _prob_min = np.mean(np.minimum.reduceat(_vals, _idxs))
+            _w = _vals - _prob_min
+            _wsum = np.add.reduceat(_w, _idxs)
+            _mean = np.add.reduceat(_w * _xs, _idxs) / _wsum
+            _std = np.sqrt(np.add.reduceat(
+                _w * (_xs - np.repeat(_mean, _sizes))**2, _idxs
+            ) / _wsum)
+            result["center"][:] = _mean
+            result["center_err"][:] = _std / np.sqrt(_sizes)
             if "width" in result:
-                result["width"].append(_std)
+                result["width"][:] = _std
         if _DEBUG:
             for i, _ad in enumerate(peaks["data"]):
                 label = f"{i:d}: {peaks['prominence'][i]:.3f}"
@@ -154,7 +165,8 @@ def find_peaks_1d(
             raise ValueError(f"Invalid fit_algorithm ({str(fit_algorithm)})")
         # Perform fit
         fits = []
-        for _ad in peaks["data"]:
+        _mask_valid = np.zeros(_npeaks, dtype=bool)
+        for i, _ad in enumerate(peaks["data"]):
             _fit = fit_class()
             _fit.find_p0(_ad)
             try:
@@ -165,6 +177,11 @@ def find_peaks_1d(
                 _fit.find_popt(_ad)
             if _fit.psuccess:
                 fits.append(_fit)
+                _mask_valid[i] = True
+                result["center"][i] = _fit.x0
+                result["center_err"][i] = _fit.x0_std
+                if "width" in result:
+                    result["width"][i] = _fit.wx
             else:
                 fits.append(None)
         if _DEBUG:
@@ -177,15 +194,11 @@ def find_peaks_1d(
                     plot.plot(
                         _xcont, _fit(_xcont), color=f"C{i:d}", label=label
                     )
-        # Get peaks from fits
-        for _fit in fits:
-            if _fit is not None:
-                result["center"].append(_fit.x0)
-                result["center_err"].append(_fit.x0_std)
-                if "width" in result:
-                    result["width"].append(_fit.wx)
-                if "fit" in result:
-                    result["fit"].append(_fit)
+        # Remove failed fits
+        for k in list(result):
+            result[k] = result[k][_mask_valid]
+        if "fit" in ret_vals:
+            result["fit"] = [_fit for _fit in fits if _fit is not None]
     if _DEBUG:
         ylim = plot.ylim()
         for i, (_c, _e) in enumerate(
@@ -217,6 +230,27 @@ def find_peak_1d(*data):
     return result["center"][0], result["center_err"][0]
 
 
+def _argsort_descending(ar, k=None):
+    """
+    Gets the indices sorting `ar` in descending order.
+
+    If `k` is given, only the indices of the `k` largest items are returned.
+    """
+    if k is None or k >= len(ar):
+        return np.flip(np.argsort(ar))
+    if k <= 0:
+        return np.empty(0, dtype=int)
+    _top = np.argpartition(ar, len(ar) - k)[len(ar) - k:]
+    # The order of tied items depends on the full sort, so fall back to it
+    _top_vals = ar[_top]
+    if (
+        np.count_nonzero(ar >= _top_vals.min()) > k
+        or len(np.unique(_top_vals)) < k
+    ):
+        return np.flip(np.argsort(ar))[:k]
+    return _top[np.flip(np.argsort(_top_vals))]
+
+
 def find_peaks_1d_prominence(
     *data, npeaks=None, rel_prominence=0.55,
     base_prominence_ratio=None, edge_peaks=False, check_npeaks="warning"
@@ -270,7 +304,7 @@ def find_peaks_1d_prominence(
         ad.set_dim(0, points=data[0])
     else:
         ad = ArrayData(data[0])
-    ar = ad.data.copy()
+    ar = ad.data
     # Find raw peaks
     if edge_peaks and len(ar) > 1:
         edge_peak_left, edge_peak_right = ar[0] > ar[1], ar[-1] > ar[-2]
@@ -283,19 +317,23 @@ def find_peaks_1d_prominence(
             ar = np.concatenate([ar, [-np.inf]])
     else:
         edge_peaks = False
+    _check_rel = npeaks is None or check_npeaks is not False
     _peaks, _props = signal.find_peaks(ar, prominence=0)
-    # Sort peaks by prominence
-    _order = np.flip(np.argsort(_props["prominences"]))
+    # Sort peaks by prominence (only the `npeaks` most prominent peaks are
+    # needed if no relative prominence check is performed)
+    _order = _argsort_descending(
+        _props["prominences"], k=(None if _check_rel else npeaks)
+    )
     peaks, prominences, = _peaks[_order], _props["prominences"][_order]
     lb, rb = _props["left_bases"][_order], _props["right_bases"][_order]
     # Filter for requested peaks
-    if npeaks is None or check_npeaks is not False:
-        _npeaks = 1
-        for i in range(_npeaks, len(peaks)):
-            if prominences[i] >= rel_prominence * np.mean(prominences[:i]):
-                _npeaks += 1
-            else:
-                break
+    if _check_rel:
+        # Running mean of more prominent peaks
+        _mean_proms = (
+            np.cumsum(prominences[:-1]) / np.arange(1, len(prominences))
+        )
+        _ok = prominences[1:] >= rel_prominence * _mean_proms
+        _npeaks = 1 + (np.argmin(_ok) if not np.all(_ok) else len(_ok))
         if npeaks is None:
             npeaks = _npeaks
         else:
@@ -338,13 +376,14 @@ def find_peaks_1d_prominence(
                         lb[i] = rb[_idx_secondary]
         # Remove zero-length peaks
         mask_keep = np.array(lb) < np.array(rb)
-        peaks = itertools.compress(peaks, mask_keep)
+        peaks = np.array(peaks)[mask_keep]
         lb, rb = np.array(lb)[mask_keep], np.array(rb)[mask_keep]
         prominences = np.array(prominences)[mask_keep]
     # Package data
+    _points = ad.get_points(0)
     return {
-        "position": np.array([ad.get_points(0)[idx] for idx in peaks]),
-        "data": [ad[lb:rb+1] for lb, rb in zip(lb, rb)],
+        "position": _points[np.asarray(peaks, dtype=int)],
+        "data": [ad[_lb:_rb+1] for _lb, _rb in zip(lb, rb)],
         "prominence": np.array(prominences)
     }
 
@@ -715,18 +754,23 @@ def correlate_g2(
         raise ValueError("data dimensions do not agree")
     # Calculate correlation
     arc = signal.correlate(ar1, ar2, mode=mode, method=method)
-    arc /= np.prod(
-        np.max([np.array(ar1.shape) - 1, np.array(ar2.shape) - 1], axis=0)
-    )
+    # Ensure floating point dtype to allow for in-place operations
+    if not np.issubdtype(arc.dtype, np.inexact):
+        arc = arc.astype(float)
+    _norm = 1
+    for _s1, _s2 in zip(ar1.shape, ar2.shape):
+        _norm *= max(_s1, _s2) - 1
+    arc /= _norm
     if connected or normalized:
         # Calculate mean
         arm = ar1.mean() * ar2.mean()
         if connected:
-            arc = arc - arm
+            arc -= arm
         if normalized:
-            res = np.zeros_like(arc, dtype=float)
-            np.divide(arc, arm, out=res, where=(arm != 0))
-            arc = res
+            if arm != 0:
+                arc /= arm
+            else:
+                arc = np.zeros_like(arc, dtype=float)
     # Calculate metadata
     if is_ad1 and is_ad2:
         dc = ArrayData(arc)